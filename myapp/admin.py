@@ -10,7 +10,7 @@ class CustomUserAdmin(UserAdmin):
     fieldsets = (
         (None, {'fields': ('employee_id','password',)}),
         ('Personal Info', {'fields': ('first_name', 'surname','birth_date',)}),
-        ('Other Info', {'fields': ('company', 'position',  'date_hired', 'pin', 'status', 'preset_name')}),
+        ('Other Info', {'fields': ('company', 'position',  'date_hired', 'pin_hash', 'status', 'preset_name')}),
         ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser')}),
     )
 
@@ -10,7 +10,7 @@ class Command(BaseCommand):
         legacy_users = UsersLegacy.objects.all()
 
         for legacy_user in legacy_users:
-            pin_password = legacy_user.pin.toString()
+            pin_password = str(legacy_user.pin)
             # Hash the password properly
             hashed_password = make_password(pin_password)
 
@@ -22,7 +22,7 @@ class Command(BaseCommand):
                 position=legacy_user.position,
                 birth_date=legacy_user.birth_date,
                 date_hired=legacy_user.date_hired,
-                pin=legacy_user.pin,
+                pin_hash=hashed_password,
                 status=legacy_user.status,
                 preset_name=legacy_user.preset_name,
                 username=legacy_user.employee_id,  # Use employee_id as username
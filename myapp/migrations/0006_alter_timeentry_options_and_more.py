@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0005_timeentry_hours_worked_timeentry_is_late_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='timeentry',
+            options={'ordering': ['-time_in']},
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', '-time_in'], name='myapp_timee_user_id_b30b98_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeentry',
+            index=models.Index(fields=['user', 'time_out'], name='myapp_timee_user_id_95c36b_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+from django.contrib.auth.hashers import make_password
+from django.db import migrations, models
+
+
+def hash_pins(apps, schema_editor):
+    CustomUser = apps.get_model('myapp', 'CustomUser')
+    users = []
+    for user in CustomUser.objects.exclude(pin__isnull=True).only('id', 'pin'):
+        user.pin_hash = make_password(user.pin)
+        users.append(user)
+    CustomUser.objects.bulk_update(users, ['pin_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_alter_timeentry_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='pin_hash',
+            field=models.CharField(max_length=128, null=True),
+        ),
+        migrations.RunPython(hash_pins, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='pin',
+        ),
+    ]
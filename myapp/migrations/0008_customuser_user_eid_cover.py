@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('myapp', '0007_hash_customuser_pin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['employee_id', 'pin_hash', 'password', 'is_staff', 'is_superuser', 'preset_name'], name='user_eid_cover'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+import datetime
+import django.db.models.expressions
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0008_customuser_user_eid_cover'),
+    ]
+
+    # GeneratedFields cannot be ALTERed into place, so drop the plain column
+    # and re-add it generated; the database recomputes it for existing rows.
+    operations = [
+        migrations.RemoveField(
+            model_name='timeentry',
+            name='hours_worked',
+        ),
+        migrations.AddField(
+            model_name='timeentry',
+            name='hours_worked',
+            field=models.GeneratedField(blank=True, db_persist=True, expression=django.db.models.functions.math.Round(models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('time_out'), '-', models.F('time_in')), '/', models.Value(datetime.timedelta(seconds=3600))), output_field=models.FloatField()), 2), null=True, output_field=models.FloatField()),
+        ),
+    ]
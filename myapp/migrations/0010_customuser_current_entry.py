@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0009_alter_timeentry_hours_worked'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='current_entry',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='myapp.timeentry'),
+        ),
+    ]
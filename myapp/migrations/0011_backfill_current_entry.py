@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+from django.db import migrations
+
+
+def backfill_current_entry(apps, schema_editor):
+    """Point each user at their latest open entry, so employees who are
+    clocked in when this deploys can still clock out through the pointer."""
+    CustomUser = apps.get_model('myapp', 'CustomUser')
+    TimeEntry = apps.get_model('myapp', 'TimeEntry')
+
+    latest_open = {}
+    open_entries = (
+        TimeEntry.objects.filter(time_out__isnull=True)
+        .order_by('user_id', '-time_in')
+        .values_list('user_id', 'id')
+    )
+    for user_id, entry_id in open_entries.iterator():
+        latest_open.setdefault(user_id, entry_id)
+
+    users = [
+        CustomUser(pk=user_id, current_entry_id=entry_id)
+        for user_id, entry_id in latest_open.items()
+    ]
+    CustomUser.objects.bulk_update(users, ['current_entry'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0010_customuser_current_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_current_entry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_backfill_current_entry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_eid_cover',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-08-29 00:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_remove_customuser_user_eid_cover'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timeentry',
+            name='time_in',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,8 +1,38 @@
+from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, ExpressionWrapper, F, Value, When
+from django.db.models.functions import Round
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from django.conf import settings
 import datetime
+import re
+
+# How long an authenticated user row may be served from the cache before we
+# go back to the database. Saves/deletes invalidate it immediately anyway.
+USER_CACHE_TIMEOUT = 60 * 60
+
+def _user_cache_key(employee_id):
+    return f'user:{employee_id}'
+
+# Shape of valid credentials; anything else is rejected before we touch the
+# cache or the database.
+_EMPLOYEE_ID_RE = re.compile(r'^[A-Za-z0-9]{1,6}$')
+_PIN_RE = re.compile(r'^\d{4}$')
+
+# A 4-digit PIN is brute-forceable, so lock an employee_id out for a while
+# after repeated wrong guesses.
+_MAX_PIN_FAILURES = 5
+_PIN_FAILURE_TIMEOUT = 5 * 60
+
+# Attendance policy, hoisted to module scope so the clock paths don't
+# rebuild these objects per request. Adjust shift times here.
+EXPECTED_START = datetime.time(8, 0)
+GRACE_PERIOD = datetime.timedelta(minutes=5)
+LATE_CUTOFF = datetime.time(9, 0)
 
 class CustomUser(AbstractUser):
     employee_id = models.CharField(unique=True, max_length=6, editable=False)
@@ -12,9 +42,14 @@ class CustomUser(AbstractUser):
     position = models.CharField(max_length=100, null=True)
     birth_date = models.DateField(null=True)
     date_hired = models.DateField(null=True)
-    pin = models.CharField(max_length=4, null=True)
+    pin_hash = models.CharField(max_length=128, null=True)
     status = models.BooleanField(default=True)
     preset_name = models.CharField(max_length=100, null=True)
+    # Points at the open TimeEntry, if any, so clock-out is a PK probe
+    # instead of a filter + order over the user's whole history.
+    current_entry = models.OneToOneField(
+        'TimeEntry', null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
 
@@ -26,81 +61,230 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = "employee_id"
     REQUIRED_FIELDS = []  # No extra required fields
 
+    # Exactly the columns the request path touches - password is in the
+    # list because login() reads it for the session auth hash, and leaving
+    # it deferred would cost a second query. Anything that loads a user it
+    # may cache (get_cached, the Celery tasks) must fetch this same set, or
+    # the cache ends up holding an instance with deferred fields and every
+    # "hit" costs a SELECT per field.
+    CACHED_FIELDS = (
+        'id', 'employee_id', 'pin_hash', 'password', 'preset_name',
+        'is_staff', 'is_superuser', 'current_entry',
+    )
+
+    @classmethod
+    def get_cached(cls, employee_id):
+        """Fetches a user by employee_id through the cache, so the hot auth
+        path usually skips the database entirely. Raises DoesNotExist just
+        like objects.get() when there is no such user."""
+        key = _user_cache_key(employee_id)
+        user = cache.get(key)
+        if user is None:
+            user = cls.objects.only(*cls.CACHED_FIELDS).get(employee_id=employee_id)
+            cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
+
+    def set_current_entry(self, entry):
+        """Repoints current_entry with one UPDATE and writes the cached copy
+        through, since queryset updates don't fire the invalidation signal."""
+        entry_id = entry.pk if entry is not None else None
+        CustomUser.objects.filter(pk=self.pk).update(current_entry=entry_id)
+        self.current_entry_id = entry_id
+        cache.set(_user_cache_key(self.employee_id), self, USER_CACHE_TIMEOUT)
+
+    def clear_current_entry(self, entry_id):
+        """Clears current_entry only while it still points at entry_id, so a
+        concurrent clock-in that already repointed it is left alone. The
+        cached copy is written through only when the clear actually landed."""
+        cleared = CustomUser.objects.filter(
+            pk=self.pk, current_entry_id=entry_id
+        ).update(current_entry=None)
+        if cleared:
+            self.current_entry_id = None
+            cache.set(_user_cache_key(self.employee_id), self, USER_CACHE_TIMEOUT)
+
+    def set_pin(self, raw_pin):
+        """Stores the PIN hashed; never keep the raw value around."""
+        self.pin_hash = make_password(raw_pin)
+
+    def check_pin(self, raw_pin):
+        """Constant-time check of a raw PIN against the stored hash."""
+        if not self.pin_hash:
+            return False
+        return check_password(raw_pin, self.pin_hash)
+
     @classmethod
     def authenticate_by_pin(cls, employee_id, pin):
-        """Tries to authenticate a user based on employee_id and pin."""
+        """Tries to authenticate a user based on employee_id and pin.
+
+        Single entry point for the login and clock views. Returns a
+        (user, error) pair; exactly one of the two is None. Validates the
+        credential shape first, serves the user row from the per-employee
+        cache, and locks the employee_id out after repeated wrong PINs.
+        """
+        if not (_EMPLOYEE_ID_RE.match(employee_id or '') and _PIN_RE.match(pin or '')):
+            return None, 'Invalid input'
+
         try:
-            user = cls.objects.get(employee_id=employee_id)
-            if user.pin == pin:
-                return user
+            user = cls.get_cached(employee_id)
         except cls.DoesNotExist:
-            return None
+            return None, 'Employee ID not found'
+
+        fail_key = f'pin_failures:{employee_id}'
+        if cache.get(fail_key, 0) >= _MAX_PIN_FAILURES:
+            return None, 'Too many attempts, try again later'
+
+        if not user.check_pin(pin):
+            try:
+                cache.incr(fail_key)
+            except ValueError:
+                cache.add(fail_key, 1, _PIN_FAILURE_TIMEOUT)
+            return None, 'Incorrect PIN'
+
+        cache.delete(fail_key)
+        return user, None
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def _invalidate_user_cache(sender, instance, **kwargs):
+    # Keep the cached row from going stale when a user is edited or removed.
+    cache.delete(_user_cache_key(instance.employee_id))
+
+def _close_updates(now):
+    """UPDATE kwargs that close an open entry: set time_out and the lateness
+    flag; hours_worked is a generated column the database fills in itself."""
+    return {
+        'time_out': now,
+        'is_late': Case(
+            When(time_in__time__gt=LATE_CUTOFF, then=Value(True)),
+            default=Value(False),
+        ),
+    }
 
 class TimeEntry(models.Model):
-    ordering = ["-time_in"]
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    time_in = models.DateTimeField(auto_now_add=True)  # Auto-set on creation
+    # Defaults to creation time, but stays settable so the queued punch
+    # tasks can record the moment the user actually punched.
+    time_in = models.DateTimeField(default=timezone.now)
     time_out = models.DateTimeField(null=True, blank=True)  # Manually set later
-    hours_worked = models.FloatField(null=True, blank=True)
+    # Derived by the database itself from the same UPDATE that sets
+    # time_out; nobody has to read-modify-write it from Python.
+    hours_worked = models.GeneratedField(
+        expression=Round(
+            ExpressionWrapper(
+                (F('time_out') - F('time_in')) / Value(datetime.timedelta(hours=1)),
+                output_field=models.FloatField(),
+            ),
+            2,
+        ),
+        output_field=models.FloatField(),
+        db_persist=True,
+        null=True,
+        blank=True,
+    )
     is_late = models.BooleanField(default=False)
 
+    class Meta:
+        ordering = ["-time_in"]
+        indexes = [
+            # latest('time_in') / per-day filters for one user
+            models.Index(fields=["user", "-time_in"]),
+            # "open entries" lookup (time_out IS NULL)
+            models.Index(fields=["user", "time_out"]),
+        ]
+
     @property
     def date(self):
         """Returns the date part of the time_in timestamp."""
         return self.time_in.date()
 
     def clock_out(self):
-        """Clocks out an entry by setting the time_out, calculating hours worked,
-        and determining lateness."""
+        """Clocks out an entry by setting the time_out and determining
+        lateness; the database derives hours_worked on its own."""
         self.time_out = timezone.now()
 
-        if self.time_in and self.time_out:
-            delta = self.time_out - self.time_in
-            # Calculate hours worked (you might also consider minutes if needed)
-            self.hours_worked = round(delta.total_seconds() / 3600, 2)
-
         # For lateness, assume an expected start time of 9:00 AM (local time)
         if self.time_in:
             # Convert time_in to local time (if your project settings use time zones)
             time_in_local = timezone.localtime(self.time_in)
-            expected_start = datetime.time(9, 0)
-            self.is_late = time_in_local.time() > expected_start
+            self.is_late = time_in_local.time() > LATE_CUTOFF
 
-        self.save()
+        # Only the columns we changed; no point rewriting the whole row.
+        self.save(update_fields=['time_out', 'is_late'])
 
     @classmethod
-    def clock_in(cls, user):
+    def clock_out_latest(cls, user, now=None):
+        """Clocks out the user's current open entry through the denormalized
+        current_entry pointer - one PK UPDATE instead of filtering and
+        ordering their whole history. Returns the time_out used, or None
+        when nothing was open. Pass now to record a punch that happened
+        earlier than task execution (queue backlog)."""
+        entry_id = user.current_entry_id
+        if entry_id is None:
+            return None
+
+        if now is None:
+            now = timezone.now()
+        # time_in__lte guards a replayed old punch against closing an entry
+        # that only opened after it; leave the pointer alone in that case.
+        closed = cls.objects.filter(
+            pk=entry_id, time_out__isnull=True, time_in__lte=now
+        ).update(**_close_updates(now))
+        if closed:
+            user.clear_current_entry(entry_id)
+        return now if closed else None
+
+    @classmethod
+    def clock_in(cls, user, now=None):
         """
         When clocking in, first check if there are any open entries (entries
         with no time_out) for the given employee and clock them out automatically.
         Then create a new entry.
+
+        Runs inside one transaction holding the user's row lock, so two
+        simultaneous clock-ins can't both see zero open entries and both
+        insert. Pass now to record a punch that happened earlier than task
+        execution (queue backlog) - lateness is judged against the punch,
+        not against when the worker got around to it.
         """
-        # Find any open entries (i.e. not clocked out)
-        open_entries = cls.objects.filter(
-            user=user,
-            time_out__isnull=True
-        )
-        for entry in open_entries:
-            entry.clock_out()
-
-        # Create a new clock-in entry
-        new_entry = cls.objects.create(user=user)
-
-        # Determine lateness (only for first entry of the day)
-        if not cls.objects.filter(user=user, time_in__date=timezone.now().date()).exists():
-            time_in_local = timezone.localtime(new_entry.time_in)
-            expected_start = datetime.time(8, 0) # Adjust time here, currently 9am
-
-            # Add 5-minute grace period
-            grace_period = datetime.timedelta(minutes=5)
-            expected_start_with_grace = datetime.datetime.combine(time_in_local.date(), expected_start) + grace_period
-
-            # Check if the user clocked in after the grace period
-            if time_in_local > expected_start_with_grace:
-                new_entry.is_late = True
-            else:
-                new_entry.is_late = False
-
-            new_entry.save()  # Make sure to save the new entry after determining lateness
-
-        return new_entry
+        if now is None:
+            now = timezone.now()
+
+        with transaction.atomic():
+            CustomUser.objects.select_for_update().only('id').get(pk=user.pk)
+
+            # Close any open entries (i.e. not clocked out) with one bulk
+            # UPDATE instead of a SELECT plus an UPDATE per row. The database
+            # computes hours_worked and lateness itself, mirroring clock_out().
+            cls.objects.filter(
+                user=user,
+                time_out__isnull=True
+            ).update(**_close_updates(now))
+
+            # Determine lateness (only for the first entry of the day) BEFORE
+            # creating the row, so the INSERT carries the flag and no
+            # follow-up save() is needed. cache.add is atomic - it returns
+            # True only when the key was absent - so the usual case costs a
+            # cache round trip instead of an exists() query.
+            today = timezone.localdate(now)
+            first_key = f'first_today:{user.pk}:{today.isoformat()}'
+            try:
+                is_first = cache.add(first_key, 1, 60 * 60 * 24)
+            except Exception:
+                # Cache backend down; ask the database instead.
+                is_first = not cls.objects.filter(user=user, time_in__date=today).exists()
+
+            is_late = False
+            if is_first:
+                time_in_local = timezone.localtime(now)
+
+                # Check if the user clocked in after the grace period
+                expected_start_with_grace = datetime.datetime.combine(
+                    time_in_local.date(), EXPECTED_START, tzinfo=time_in_local.tzinfo
+                ) + GRACE_PERIOD
+                is_late = time_in_local > expected_start_with_grace
+
+            # Create a new clock-in entry and point the user at it
+            new_entry = cls.objects.create(user=user, time_in=now, is_late=is_late)
+            user.set_current_entry(new_entry)
+            return new_entry
@@ -117,10 +117,11 @@ clockInForm.addEventListener('submit', (e) => {
     fetch('/clock_in/', {
         method: 'POST',
         headers: {
-            'Content-Type': 'application/json',
             'X-CSRFToken': csrftoken,
         },
-        body: JSON.stringify({ employee_id, pin }),
+        // Form-encoded body; Django parses this into request.POST without
+        // touching a JSON parser.
+        body: new URLSearchParams({ employee_id, pin }),
     })
     .then(response => response.json())
     .then(data => {
@@ -151,10 +152,11 @@ clockOutForm.addEventListener('submit', (e) => {
     fetch('/clock_out/', {
         method: 'POST',
         headers: {
-            'Content-Type': 'application/json',
             'X-CSRFToken': csrftoken,
         },
-        body: JSON.stringify({ employee_id, pin }),
+        // Form-encoded body; Django parses this into request.POST without
+        // touching a JSON parser.
+        body: new URLSearchParams({ employee_id, pin }),
     })
     .then(response => response.json())
     .then(data => {
@@ -0,0 +1,84 @@
+from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import CustomUser, TimeEntry
+
+# Punch bookkeeping lives in the shared cache: one key per applied punch
+# (dedupes broker redeliveries) and one last-applied marker per user (drops
+# a punch arriving after a later one was already applied, so out-of-order
+# workers can't resurrect a closed shift). Nothing is recorded until the
+# database work has committed - a crash or retry in between redelivers the
+# punch instead of silently dropping it.
+_PUNCH_TTL = 60 * 60 * 24
+
+def _should_apply(action, user_id, punch_time):
+    """Pure reads: True when this punch hasn't been applied yet and no
+    later punch for the user has."""
+    if cache.get(f'punch:{action}:{user_id}:{punch_time}'):
+        return False
+
+    last = cache.get(f'punch_last:{user_id}')
+    if last is not None and last >= punch_time:
+        return False
+
+    return True
+
+def _mark_applied(action, user_id, punch_time):
+    """Records a punch as consumed. Only ever called for committed work
+    (directly, or through transaction.on_commit). ISO-8601 UTC timestamps
+    compare lexicographically, so string order is chronological order."""
+    cache.set(f'punch:{action}:{user_id}:{punch_time}', 1, _PUNCH_TTL)
+    last_key = f'punch_last:{user_id}'
+    last = cache.get(last_key)
+    if last is None or punch_time > last:
+        cache.set(last_key, punch_time, _PUNCH_TTL)
+
+@shared_task
+def record_clock_in(user_id, punch_time):
+    """Runs the transactional clock-in off the request path. Duplicate
+    deliveries are dropped by the cache marks or, if a crash lost them, by
+    the punch timestamp already recorded on the row; stale punches that
+    arrive after a later one was applied are skipped."""
+    if not _should_apply('in', user_id, punch_time):
+        return
+
+    punch_at = parse_datetime(punch_time)
+    with transaction.atomic():
+        # Lock + load in one query so the dedupe check and the clock-in see
+        # fresh state; clock_in re-takes the same lock inside this
+        # transaction, which is a no-op.
+        user = CustomUser.objects.select_for_update().only(
+            *CustomUser.CACHED_FIELDS
+        ).get(pk=user_id)
+
+        # DB-backed dedupe: the row carries the punch timestamp, so a
+        # redelivery whose work already committed finds its entry here even
+        # when the crash happened before the cache marks were written.
+        if TimeEntry.objects.filter(user_id=user_id, time_in=punch_at).exists():
+            _mark_applied('in', user_id, punch_time)
+            return
+
+        TimeEntry.clock_in(user, now=punch_at)
+        transaction.on_commit(lambda: _mark_applied('in', user_id, punch_time))
+
+@shared_task
+def record_clock_out(user_id, punch_time):
+    """Closes the user's current entry off the request path, behind the
+    same duplicate/ordering guards as record_clock_in."""
+    if not _should_apply('out', user_id, punch_time):
+        return
+
+    punch_at = parse_datetime(punch_time)
+    with transaction.atomic():
+        user = CustomUser.objects.select_for_update().only(
+            *CustomUser.CACHED_FIELDS
+        ).get(pk=user_id)
+
+        if TimeEntry.objects.filter(user_id=user_id, time_out=punch_at).exists():
+            _mark_applied('out', user_id, punch_time)
+            return
+
+        TimeEntry.clock_out_latest(user, now=punch_at)
+        transaction.on_commit(lambda: _mark_applied('out', user_id, punch_time))
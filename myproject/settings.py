@@ -74,6 +74,17 @@ WSGI_APPLICATION = 'myproject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Shared Redis cache. The auth cache, PIN-failure lockout, first-of-day
+# keys and the current_entry write-through all assume every web worker AND
+# the Celery workers see the same store - Django's default per-process
+# LocMemCache would silently fragment them.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    }
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
@@ -134,4 +145,10 @@ APPEND_SLASH = False
 
 AUTH_USER_MODEL = 'myapp.CustomUser'
 
+# Celery: the clock-in/out write path runs on workers so start-of-shift
+# bursts don't hold web workers on the database. In DEBUG the tasks run
+# inline, so no broker is needed for development.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://127.0.0.1:6379/0')
+CELERY_TASK_ALWAYS_EAGER = DEBUG
+
 LOGOUT_REDIRECT_URL = 'login'
\ No newline at end of file